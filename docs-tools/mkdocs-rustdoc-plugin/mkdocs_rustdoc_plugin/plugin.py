@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -11,6 +14,15 @@ from mkdocs.config import config_options
 from mkdocs.exceptions import PluginError
 from mkdocs.plugins import BasePlugin
 
+# Environment variables that change what rustdoc produces (or whether it
+# fails, e.g. RUSTDOCFLAGS="-D warnings"); part of the skip-stamp digest.
+_FLAG_ENV_VARS = (
+    "RUSTDOCFLAGS",
+    "RUSTFLAGS",
+    "CARGO_ENCODED_RUSTDOCFLAGS",
+    "CARGO_ENCODED_RUSTFLAGS",
+)
+
 
 class RustdocPlugin(BasePlugin):
     config_scheme = (
@@ -22,12 +34,15 @@ class RustdocPlugin(BasePlugin):
         ),
         ("markdown_output", config_options.Type(str, default="docs/api/rustdoc.md")),
         ("site_subdir", config_options.Type(str, default="rustdoc")),
+        ("verbose", config_options.Type(bool, default=False)),
     )
 
     def on_pre_build(self, config):
         """
         Prepare Rust documentation before the MkDocs build by running `cargo doc`, generating a Markdown index of crates, and recording the rustdoc output directory.
 
+        `cargo doc` is skipped when a stamp in the workspace `target` directory shows that the manifests, crate sources, and cargo arguments are unchanged since the last successful run.
+
         Parameters:
             config (mkdocs.config.defaults.Theme): MkDocs build configuration object; used to derive project paths and site URL.
 
@@ -40,22 +55,54 @@ class RustdocPlugin(BasePlugin):
         project_root = Path(config.config_file_path).resolve().parent
         workspace_root = (project_root / self.config["workspace_root"]).resolve()
         crate_dir = (project_root / self.config["crate_dir"]).resolve()
-        cargo_doc_args = list(self.config["cargo_doc_args"])
+        cargo_doc_args = self.config["cargo_doc_args"]
+        verbose = self.config["verbose"]
 
         if not crate_dir.exists():
             raise PluginError(f"crate_dir does not exist: {crate_dir}")
 
-        cmd = ["cargo", "doc", *cargo_doc_args]
-        try:
-            subprocess.run(cmd, cwd=crate_dir, check=True)
-        except FileNotFoundError as error:
-            raise PluginError("cargo is required for rustdoc generation") from error
-        except subprocess.CalledProcessError as error:
-            raise PluginError(
-                f"cargo doc failed with exit code {error.returncode}"
-            ) from error
-
         rustdoc_dir = workspace_root / "target" / "doc"
+        stamp_path = workspace_root / "target" / ".mkdocs_rustdoc_stamp"
+        digest = self._inputs_digest(workspace_root, crate_dir, cargo_doc_args)
+        # The stamp also records the output tree's signature, so a
+        # `target/doc` rewritten by some other `cargo doc` run is rebuilt.
+        up_to_date = (
+            rustdoc_dir.is_dir()
+            and stamp_path.is_file()
+            and stamp_path.read_text(encoding="utf-8")
+            == f"{digest}\n{self._output_signature(rustdoc_dir)}"
+        )
+
+        if not up_to_date:
+            # Unless verbose, drop cargo's per-crate progress output; errors
+            # and warnings still reach stderr.  --quiet goes before the
+            # configured args so it is always parsed as a cargo flag.
+            cmd = ("cargo", "doc", *(() if verbose else ("--quiet",)), *cargo_doc_args)
+            env = {**os.environ, "CARGO_TERM_COLOR": "never"}
+            # Respect an explicit CARGO_INCREMENTAL=0 (common in CI).
+            env.setdefault("CARGO_INCREMENTAL", "1")
+            try:
+                subprocess.run(
+                    cmd,
+                    cwd=crate_dir,
+                    check=True,
+                    env=env,
+                    stdout=None if verbose else subprocess.DEVNULL,
+                )
+            except FileNotFoundError as error:
+                raise PluginError(
+                    "cargo is required for rustdoc generation"
+                ) from error
+            except subprocess.CalledProcessError as error:
+                raise PluginError(
+                    f"cargo doc failed with exit code {error.returncode}"
+                ) from error
+            if rustdoc_dir.is_dir():
+                stamp_path.write_text(
+                    f"{digest}\n{self._output_signature(rustdoc_dir)}",
+                    encoding="utf-8",
+                )
+
         if not rustdoc_dir.exists():
             raise PluginError(f"rustdoc output missing: {rustdoc_dir}")
 
@@ -71,6 +118,96 @@ class RustdocPlugin(BasePlugin):
 
         self._rustdoc_dir = rustdoc_dir
 
+    def _inputs_digest(
+        self, workspace_root: Path, crate_dir: Path, cargo_doc_args: list[str]
+    ) -> str:
+        """
+        Compute a digest of everything that can change the `cargo doc` output.
+
+        Hashes the cargo arguments, the rustc/rustdoc flag environment variables, the `rustc -V` toolchain version, the contents of the workspace `Cargo.toml` and `Cargo.lock`, and the path, size, and modification time of every file under `crate_dir` (skipping hidden and `target` directories).
+
+        Parameters:
+            workspace_root (Path): Cargo workspace root containing the top-level manifest and lockfile.
+            crate_dir (Path): Directory whose files feed rustdoc (sources, crate manifests, included docs).
+            cargo_doc_args (list[str]): Extra arguments passed to `cargo doc`.
+
+        Returns:
+            str: Hex digest identifying the current rustdoc inputs.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("\0".join(cargo_doc_args).encode("utf-8"))
+        for var in _FLAG_ENV_VARS:
+            digest.update(f"\0{var}={os.environ.get(var, '')}".encode("utf-8"))
+        digest.update(self._toolchain_version(crate_dir).encode("utf-8"))
+        for name in ("Cargo.toml", "Cargo.lock"):
+            manifest = workspace_root / name
+            if manifest.is_file():
+                digest.update(name.encode("utf-8"))
+                digest.update(manifest.read_bytes())
+
+        stack = [str(crate_dir)]
+        while stack:
+            current = stack.pop()
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith(".") and entry.name != "target":
+                        stack.append(entry.path)
+                    continue
+                st = entry.stat()
+                digest.update(
+                    f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8")
+                )
+        return digest.hexdigest()
+
+    def _toolchain_version(self, crate_dir: Path) -> str:
+        """
+        Return the `rustc -V` output for the toolchain cargo will use in `crate_dir`.
+
+        Parameters:
+            crate_dir (Path): Directory `cargo doc` runs in (so `rust-toolchain` overrides apply).
+
+        Returns:
+            str: The version line, or an empty string if `rustc` cannot be run.
+        """
+        try:
+            result = subprocess.run(
+                ["rustc", "-V"],
+                cwd=crate_dir,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+        return result.stdout.strip()
+
+    def _output_signature(self, rustdoc_dir: Path) -> str:
+        """
+        Summarise the top level of the rustdoc output tree by entry name, size, and modification time.
+
+        Any `cargo doc` run rewrites top-level files such as the search index, so a changed signature means the tree no longer matches the stamp.
+
+        Parameters:
+            rustdoc_dir (Path): The rustdoc output directory (typically `target/doc`).
+
+        Returns:
+            str: Hex digest of the top-level entries, or an empty string if the directory is missing.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with os.scandir(rustdoc_dir) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return ""
+        for entry in entries:
+            st = entry.stat(follow_symlinks=False)
+            digest.update(
+                f"{entry.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8")
+            )
+        return digest.hexdigest()
+
     def on_post_build(self, config):
         """
         Copy the previously generated rustdoc output into the built site under the configured site subdirectory.
@@ -96,7 +233,35 @@ class RustdocPlugin(BasePlugin):
 
         if destination.exists():
             shutil.rmtree(destination)
-        shutil.copytree(rustdoc_dir, destination)
+        self._copy_tree(rustdoc_dir, destination)
+
+    def _copy_tree(self, source: Path, destination: Path) -> None:
+        """
+        Copy the `source` tree into `destination`, copying files concurrently.
+
+        Walks `source` with `os.scandir` (reusing cached entry types), creates every destination directory up front, then copies files with `shutil.copy2` on a thread pool, since the tree is thousands of small, latency-bound files and the copies release the GIL.
+
+        Parameters:
+            source (Path): Directory to copy (the rustdoc output tree).
+            destination (Path): Directory to create; must not already exist.
+        """
+        pairs: list[tuple[str, Path]] = []
+        stack = [(source, destination)]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            dst_dir.mkdir(parents=True)
+            with os.scandir(src_dir) as entries:
+                for entry in entries:
+                    target = dst_dir / entry.name
+                    if entry.is_dir():
+                        stack.append((Path(entry.path), target))
+                    else:
+                        pairs.append((entry.path, target))
+
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Consume the iterator so copy errors propagate.
+            list(pool.map(lambda pair: shutil.copy2(*pair), pairs))
 
     def _collect_crate_links(self, rustdoc_dir: Path) -> list[str]:
         """
@@ -112,13 +277,18 @@ class RustdocPlugin(BasePlugin):
             list[str]: Alphabetically sorted crate directory names that contain an `index.html`.
         """
         crate_names: list[str] = []
-        for entry in rustdoc_dir.iterdir():
-            if not entry.is_dir():
-                continue
-            if entry.name.startswith("."):
-                continue
-            index_file = entry / "index.html"
-            if index_file.exists():
+        with os.scandir(rustdoc_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                # DirEntry.is_dir reuses the listing's entry type, so each
+                # crate costs a single stat (for index.html).
+                if not entry.is_dir():
+                    continue
+                try:
+                    os.stat(os.path.join(entry.path, "index.html"))
+                except FileNotFoundError:
+                    continue
                 crate_names.append(entry.name)
 
         crate_names.sort()
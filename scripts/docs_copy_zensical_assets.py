@@ -1,34 +1,171 @@
+import functools
+import hashlib
+import importlib.util
+import os
 import pathlib
 import shutil
-import importlib
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Buffer size for the Python-level copy loop; the 64 KiB shutil default
+# is too small for bulk sequential IO.
+_COPY_BUFSIZE = 1024 * 1024
+
+# Platforms where shutil.copyfile uses a kernel fast-copy path (the same
+# checks shutil makes for sendfile and fcopyfile).
+_KERNEL_COPY_PLATFORMS = ("linux", "sunos", "darwin")
+
+# Below this many files a thread pool costs more than it saves.
+_PARALLEL_MIN_FILES = 16
+
+# Digests of the source tree and of the destination tree as last copied,
+# kept under .local/ (with the docs check config) rather than in the docs
+# tree.
+_MANIFEST_PATH = pathlib.Path(".local") / "zensical_assets.manifest"
+
+
+def _copy_file(src: str, dst: pathlib.Path) -> None:
+    """
+    Copy file data (no permissions or timestamps) from `src` to `dst` through the fastest path the platform offers.
+
+    shutil.copyfile uses the kernel fast-copy paths on Linux/Solaris (sendfile) and macOS (fcopyfile), and on Windows already reads through a 1 MiB buffer. Everywhere else (e.g. the BSDs) shutil would fall back to its default-size buffer, so the data is streamed in `_COPY_BUFSIZE` chunks instead.
+    """
+    if os.name == "nt" or sys.platform.startswith(_KERNEL_COPY_PLATFORMS):
+        shutil.copyfile(src, dst)
+    else:
+        with (
+            open(src, "rb", buffering=_COPY_BUFSIZE) as fsrc,
+            open(dst, "wb", buffering=_COPY_BUFSIZE) as fdst,
+        ):
+            shutil.copyfileobj(fsrc, fdst, length=_COPY_BUFSIZE)
+
+
+def _retry_writable(func, path, exc) -> None:
+    """
+    `shutil.rmtree` error handler that clears the read-only bit and retries once.
+
+    Any error on the retry is ignored, matching the previous `ignore_errors=True` behaviour.
+    """
+    try:
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+    except OSError:
+        pass
+
+
+def _fast_copytree(src: pathlib.Path, dst: pathlib.Path) -> None:
+    """
+    Recursively copy the file contents of `src` into `dst`.
+
+    Walks with `os.scandir`, whose entries cache the file type, creates every destination directory up front, then copies file data only (no permission/timestamp copy). Trees with at least `_PARALLEL_MIN_FILES` files are copied on a thread pool so per-file open/close latency overlaps; the copy calls release the GIL.
+    """
+    pairs: list[tuple[str, pathlib.Path]] = []
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                target = dst_dir / entry.name
+                if entry.is_dir():
+                    stack.append((pathlib.Path(entry.path), target))
+                else:
+                    pairs.append((entry.path, target))
+
+    if len(pairs) < _PARALLEL_MIN_FILES:
+        for src_file, dst_file in pairs:
+            _copy_file(src_file, dst_file)
+        return
+
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_copy_file, s, d) for s, d in pairs]
+        for future in as_completed(futures):
+            future.result()
+
+
+def _tree_digest(root: pathlib.Path) -> str:
+    """
+    Hash the relative path, size, and mtime of every file under `root`.
+
+    Only directory entries are stat'ed; no file contents are read, so an unchanged tree is recognised with a single walk.
+    """
+    digest = hashlib.blake2b(str(root).encode("utf-8"), digest_size=16)
+    stack = [(root, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            rel = f"{prefix}{entry.name}"
+            if entry.is_dir():
+                stack.append((pathlib.Path(entry.path), f"{rel}/"))
+            else:
+                st = entry.stat()
+                line = f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n"
+                digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _zensical_assets_dir() -> pathlib.Path:
+    """
+    Locate the installed `zensical` package's templates/assets directory without importing it.
+
+    Uses `importlib.util.find_spec`, so none of zensical's module-level code runs. The result is cached for repeated calls in one process.
+
+    Raises:
+        SystemExit: If `zensical` is not installed or its spec has no location.
+    """
+    spec = importlib.util.find_spec("zensical")
+    if spec is None:
+        raise SystemExit("zensical module not found")
+    if spec.submodule_search_locations:
+        package_dir = pathlib.Path(spec.submodule_search_locations[0])
+    elif spec.origin:
+        package_dir = pathlib.Path(spec.origin).parent
+    else:
+        raise SystemExit("zensical module has no __file__")
+    return package_dir.resolve() / "templates" / "assets"
 
 
 def main() -> int:
     """
     Copy the installed `zensical` package's templates/assets directory into the repository's docs/assets directory, replacing any existing destination.
 
+    The copy is skipped when `.local/zensical_assets.manifest` records the same source tree digest as the installed package and the same destination tree digest as the current `docs/assets`, so edited or deleted assets are still restored.
+
     Returns:
         int: Exit code 0 on success.
 
 
     Raises:
-        SystemExit: If the `zensical` module has no `__file__` attribute or if the source assets directory does not exist.
+        SystemExit: If the `zensical` module cannot be located or if the source assets directory does not exist.
     """
     repo_root = pathlib.Path(__file__).resolve().parents[1]
 
-    zensical = importlib.import_module("zensical")
-    zensical_file = getattr(zensical, "__file__", None)
-    if not zensical_file:
-        raise SystemExit("zensical module has no __file__")
-
-    src = pathlib.Path(zensical_file).resolve().parent / "templates" / "assets"
+    src = _zensical_assets_dir()
     dst = repo_root / "docs" / "assets"
 
     if not src.exists():
         raise SystemExit(f"zensical assets dir not found: {src}")
 
-    shutil.rmtree(dst, ignore_errors=True)
-    shutil.copytree(src, dst)
+    src_digest = _tree_digest(src)
+    manifest = repo_root / _MANIFEST_PATH
+    try:
+        recorded = manifest.read_text(encoding="utf-8")
+        if dst.is_dir() and recorded == f"{src_digest}\n{_tree_digest(dst)}":
+            print("Assets up to date")
+            return 0
+    except OSError:
+        pass
+
+    shutil.rmtree(dst, onexc=_retry_writable)
+    _fast_copytree(src, dst)
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(f"{src_digest}\n{_tree_digest(dst)}", encoding="utf-8")
     print(f"Copied zensical assets: {src} -> {dst}")
     return 0
 
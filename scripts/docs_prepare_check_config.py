@@ -2,6 +2,10 @@ import pathlib
 import re
 
 
+_SITE_DIR_RE = re.compile(rb'(?m)^site_dir\s*=\s*"site"\s*$')
+_SITE_DIR_REPLACEMENT = b'site_dir = "site-check"'
+
+
 def main() -> int:
     """
     Prepare a check configuration by copying `zensical.toml` to `.local/zensical.check.toml` with `site_dir` changed to "site-check".
@@ -19,18 +23,22 @@ def main() -> int:
     local_dir.mkdir(parents=True, exist_ok=True)
 
     src_path = pathlib.Path("zensical.toml")
-    text = src_path.read_text(encoding="utf-8")
+    # The edit only touches an ASCII line, so work on raw bytes and skip
+    # the UTF-8 decode/encode round trip.
+    data = bytearray(src_path.read_bytes())
 
-    pattern = r'(?m)^site_dir\s*=\s*"site"\s*$'
-    replacement = 'site_dir = "site-check"'
-    text, count = re.subn(pattern, replacement, text, count=1)
-    if count != 1:
+    match = _SITE_DIR_RE.search(data)
+    if match is None:
         raise SystemExit(
-            f"Expected exactly one site_dir assignment in {src_path}; found {count}"
+            f"Expected exactly one site_dir assignment in {src_path}; found 0"
         )
+    # Splice the replacement over the matched span in place rather than
+    # building a second copy of the whole file.
+    data[match.start() : match.end()] = _SITE_DIR_REPLACEMENT
 
     out_path = local_dir / "zensical.check.toml"
-    out_path.write_text(text, encoding="utf-8")
+    with out_path.open("wb") as f:
+        f.write(memoryview(data))
     print(f"Wrote {out_path}")
     return 0
 